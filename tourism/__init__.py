@@ -0,0 +1 @@
+"""Data access helpers for the Indian Tourism Streamlit app."""
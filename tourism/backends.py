@@ -0,0 +1,191 @@
+"""Where queries run: the Snowflake warehouse or a local DuckDB copy of ``data/``."""
+
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+from .snapshot import snapshot_files
+from .sources import DATA_DIR, MISSING_TABLES, SOURCES, read_source
+from .timing import timed
+
+
+class SnowflakeBackend:
+    name = "snowflake"
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def query(self, sql, params=None):
+        return self.execute(sql, params)[0]
+
+    def execute(self, sql, params=None, tag=None):
+        """(DataFrame, query id); ``tag`` becomes the statement's QUERY_TAG."""
+        statement_params = {"QUERY_TAG": tag} if tag else None
+        with self.pool.session() as session:
+            with session.query_history() as history:
+                df = session.sql(sql, params=params).to_pandas(statement_params=statement_params)
+        query_id = history.queries[-1].query_id if history.queries else None
+        return df, query_id
+
+    def arrow(self, sql):
+        """Arrow table of ``sql``, typed by the warehouse even when it has no rows."""
+        with self.pool.session() as session:
+            return session.sql(sql).to_arrow()
+
+    def table_versions(self):
+        """{table: creation time, rows and bytes} of every table in the current schema.
+
+        SHOW TABLES is answered from metadata without a warehouse, unlike
+        INFORMATION_SCHEMA, so polling it never keeps the warehouse from
+        suspending. The ETL swaps in a new table on every load, which
+        changes its creation time; other writes change its rows or bytes.
+        """
+        with self.pool.session() as session:
+            tables = [row.asDict() for row in session.sql("SHOW TABLES").collect()]
+        return {
+            table["name"].upper(): f"{table['created_on']}/{table['rows']}/{table['bytes']}"
+            for table in tables
+        }
+
+    def stats(self):
+        return self.pool.stats()
+
+
+class DuckDBBackend:
+    """In-memory DuckDB database laid out like ``TOURISM.PUBLIC`` in Snowflake.
+
+    Built either from the raw CSVs (tables loaded as-is, including their
+    'Total' rows) or from a Parquet snapshot, so the app's queries behave as
+    they do against the warehouse without credentials or network round trips.
+    """
+
+    def __init__(self, name="local"):
+        import duckdb
+
+        self.name = name
+        self._conn = duckdb.connect(":memory:")
+        self._conn.execute("ATTACH ':memory:' AS TOURISM")
+        self._conn.execute("CREATE SCHEMA TOURISM.PUBLIC")
+        self._conn.create_function(
+            "INITCAP", _initcap, ["VARCHAR"], "VARCHAR", null_handling="special"
+        )
+        self._queries = 0
+        self._lock = threading.Lock()
+        # File behind each table, and for CSV tables the version loaded
+        self._files = {}
+        self._sources = {}
+        self._loaded = {}
+
+    @classmethod
+    def from_csv(cls, data_dir=DATA_DIR):
+        backend = cls("local")
+        for source in SOURCES:
+            backend._files[source.table] = Path(data_dir) / source.file
+            backend._sources[source.table] = source
+            backend._load_source(source.table)
+        for table, columns in MISSING_TABLES.items():
+            ddl = ", ".join(f'"{name}" {dtype}' for name, dtype in columns.items())
+            backend._conn.execute(f"CREATE TABLE TOURISM.PUBLIC.{table} ({ddl})")
+        return backend
+
+    @classmethod
+    def from_snapshot(cls, snapshot_dir):
+        """Expose every ``<TABLE>.parquet`` in ``snapshot_dir`` as a view.
+
+        DuckDB scans the files in place, so worker processes on one host
+        share them through the OS page cache instead of each holding a copy.
+        """
+        backend = cls("snapshot")
+        for table, path in snapshot_files(snapshot_dir).items():
+            backend._files[table] = path
+            location = str(path).replace("'", "''")
+            backend._conn.execute(
+                f"CREATE VIEW TOURISM.PUBLIC.{table} AS SELECT * FROM read_parquet('{location}')"
+            )
+        return backend
+
+    def load_table(self, table, df):
+        self._conn.register("_incoming", df)
+        try:
+            self._conn.execute(f"CREATE OR REPLACE TABLE TOURISM.PUBLIC.{table} AS SELECT * FROM _incoming")
+        finally:
+            self._conn.unregister("_incoming")
+
+    def _load_source(self, table):
+        # Stat before reading, so a file rewritten meanwhile is reloaded again
+        path = self._files[table]
+        version = _file_version(path)
+        self.load_table(table, read_source(self._sources[table], path.parent))
+        self._loaded[table] = version
+
+    def table_versions(self):
+        """{table: mtime and size of its file}.
+
+        CSV tables are copied into memory, so any whose file changed is
+        reloaded first; snapshot views read their Parquet file directly.
+        """
+        versions = {}
+        for table, path in self._files.items():
+            versions[table] = _file_version(path)
+            changed = versions[table] not in (None, self._loaded.get(table))
+            if table in self._sources and changed:
+                self._load_source(table)
+        return versions
+
+    def query(self, sql, params=None):
+        return self.execute(sql, params)[0]
+
+    def execute(self, sql, params=None, tag=None):
+        """(DataFrame, None): DuckDB has neither query ids nor query tags."""
+        # A cursor is a separate connection to the same database, which makes
+        # concurrent queries from run_queries' worker threads safe.
+        with timed("session"):
+            cursor = self._conn.cursor()
+        try:
+            cursor.execute("USE TOURISM.PUBLIC")
+            df = cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+        with self._lock:
+            self._queries += 1
+        return df, None
+
+    def arrow(self, sql):
+        """Arrow table of ``sql``, typed by DuckDB even when it has no rows."""
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute("USE TOURISM.PUBLIC")
+            result = cursor.execute(sql).arrow()
+            # A RecordBatchReader in newer DuckDB releases, a Table before
+            return result.read_all() if hasattr(result, "read_all") else result
+        finally:
+            cursor.close()
+
+    def stats(self):
+        return {"queries": self._queries}
+
+
+def _file_version(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _initcap(value):
+    return value.title() if value is not None else None
+
+
+@st.cache_resource
+def get_backend():
+    from .config import BACKEND, SNAPSHOT_DIR
+
+    if BACKEND == "local":
+        return DuckDBBackend.from_csv()
+    if BACKEND == "snapshot":
+        return DuckDBBackend.from_snapshot(SNAPSHOT_DIR)
+    from .session import get_session_pool
+
+    return SnowflakeBackend(get_session_pool())
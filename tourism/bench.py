@@ -0,0 +1,151 @@
+"""Benchmark the app's data path against the local DuckDB backend.
+
+    python -m tourism.bench [--runs N] [--states N] [--save-baseline] [--tolerance 0.25]
+
+Every section is rerun headlessly (``streamlit.testing``) for each state in
+its selector, both cold (query, frame and figure caches cleared first) and
+warm. Each rerun is split into phases:
+
+    rerun      wall time of the whole script run
+    session    waiting for a Snowpark session / opening a DuckDB cursor
+    query      time in the backend, in total and per named query
+    transform  building the shared frames and per-state views
+    figure     building figures (including their small aggregations)
+
+Phases nest (``query`` includes ``session``), so they do not add up to
+``rerun``. The p50/p95/p99 of each phase are compared with
+``benchmarks/baseline.json``; the exit status is 1 if any p95 regressed by
+more than ``--tolerance``. Baselines are machine-specific and only
+comparable with runs over the same states: refresh them with
+``--save-baseline`` on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from .timing import recording
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "streamlit_app.py"
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+SECTIONS = ["Festivals and Pilgrimage", "Experience & Adventure Sports", "Stats"]
+PHASES = ["rerun", "session", "query", "transform", "figure"]
+PERCENTILES = (50, 95, 99)
+
+# Differences below this are timer noise, whatever the ratio
+NOISE_MS = 1.0
+
+
+def _phase_totals(samples, wall):
+    totals = dict.fromkeys(PHASES, 0.0)
+    totals["rerun"] = wall
+    for phase, seconds in samples:
+        if phase.startswith("query:"):
+            totals["query"] += seconds
+            totals[phase] = totals.get(phase, 0.0) + seconds
+        else:
+            totals[phase] += seconds
+    return totals
+
+
+def run_benchmark(runs=3, max_states=None):
+    """{"section|mode|phase": [milliseconds per rerun]} for every rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    from .cache import invalidate_query_cache
+
+    results = defaultdict(list)
+    app = AppTest.from_file(str(APP), default_timeout=300)
+    app.run()
+    for section in SECTIONS:
+        app.radio(key="section").set_value(section).run()
+        states = list(app.selectbox[0].options)[:max_states]
+        for state in states:
+            for mode in ("cold", "warm"):
+                for _ in range(runs):
+                    if mode == "cold":
+                        invalidate_query_cache()
+                    with recording() as samples:
+                        start = time.perf_counter()
+                        app.selectbox[0].set_value(state).run()
+                        wall = time.perf_counter() - start
+                    if app.exception:
+                        raise RuntimeError(f"{section} / {state}: {app.exception[0].message}")
+                    for phase, seconds in _phase_totals(samples, wall).items():
+                        results[f"{section}|{mode}|{phase}"].append(seconds * 1000)
+    return results
+
+
+def summarize(results):
+    return {
+        key: {f"p{p}": round(float(np.percentile(values, p)), 2) for p in PERCENTILES} | {"n": len(values)}
+        for key, values in sorted(results.items())
+    }
+
+
+def compare(summary, baseline, tolerance):
+    """Keys whose p95 is more than ``tolerance`` (and NOISE_MS) above the baseline."""
+    regressions = []
+    for key, stats in summary.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if stats["p95"] > before["p95"] * (1 + tolerance) and stats["p95"] - before["p95"] > NOISE_MS:
+            regressions.append(key)
+    return regressions
+
+
+def format_table(summary, baseline, regressions):
+    lines = [f"{'section':<30} {'mode':<5} {'phase':<28} {'n':>4} "
+             f"{'p50':>8} {'p95':>8} {'p99':>8} {'base p95':>9} {'change':>7}"]
+    for key, stats in summary.items():
+        section, mode, phase = key.split("|")
+        before = baseline.get(key)
+        base = f"{before['p95']:9.1f}" if before else f"{'-':>9}"
+        change = (f"{(stats['p95'] / before['p95'] - 1) * 100:+6.0f}%"
+                  if before and before["p95"] > 0 else f"{'-':>7}")
+        flag = "  REGRESSED" if key in regressions else ""
+        lines.append(f"{section:<30} {mode:<5} {phase:<28} {stats['n']:>4} {stats['p50']:8.1f} "
+                     f"{stats['p95']:8.1f} {stats['p99']:8.1f} {base} {change}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="reruns per state and mode")
+    parser.add_argument("--states", type=int, default=None, help="only the first N states of each section")
+    parser.add_argument("--backend", choices=["local", "snapshot"], default="local")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    # Read by tourism.config, so set before the app is first imported
+    os.environ["TOURISM_BACKEND"] = args.backend
+    os.environ["TOURISM_NAVIGATION"] = "lazy"
+    os.environ["TOURISM_WARMUP"] = "off"
+
+    summary = summarize(run_benchmark(args.runs, args.states))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(summary, baseline, args.tolerance)
+    print(format_table(summary, baseline, regressions))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(summary, indent=1, sort_keys=True) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} phases regressed by more than {args.tolerance:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
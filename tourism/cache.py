@@ -0,0 +1,219 @@
+"""Process-wide TTL + LRU cache for query results."""
+
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+# Quoted literals/identifiers are kept verbatim; only whitespace between them
+# is collapsed so reformatting a query does not change its cache key.
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_SPACE = re.compile(r"\s+")
+# Table names after FROM/JOIN, optionally qualified and quoted
+_TABLE = re.compile(r'\b(?:FROM|JOIN)\s+((?:"?\w+"?\.)*"?\w+"?)', re.IGNORECASE)
+
+MISSING = object()
+
+# (callback, tables) pairs that drop data derived from query results (e.g.
+# local frames); tables is None for data derived from every table.
+_invalidation_hooks = []
+
+# Bumped on every invalidation; part of the key of anything derived from data
+_data_version = 0
+# Backend version of each table (SHOW TABLES metadata, or its file's mtime and
+# size), kept current by tourism.watermarks. Unlike a counter it means the same in
+# every process, so it can key entries of the cache shared between them.
+_table_versions = {}
+
+
+def normalize_sql(sql):
+    parts = _QUOTED.split(sql.strip().rstrip(";"))
+    for i in range(0, len(parts), 2):
+        parts[i] = _SPACE.sub(" ", parts[i])
+    return "".join(parts).strip()
+
+
+def make_key(sql, params=None):
+    """(sql, params, versions of the tables it reads)."""
+    sql = normalize_sql(sql)
+    return sql, tuple(params or ()), data_version(tables_of(sql))
+
+
+@functools.lru_cache(maxsize=1024)
+def tables_of(sql):
+    """Upper-case names of the tables ``sql`` reads, without schema or quotes."""
+    return frozenset(name.split(".")[-1].strip('"').upper() for name in _TABLE.findall(sql))
+
+
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+class QueryCache:
+    """Thread-safe cache with a time-to-live and LRU eviction.
+
+    Eviction happens when either ``max_entries`` or ``max_bytes`` (measured
+    with ``DataFrame.memory_usage``) is exceeded. Expired entries are kept
+    until then, so ``stale()`` can still serve them when the warehouse is
+    busy; ``invalidate()`` drops them for good. Callers always get a copy so
+    that column assignments in the app never mutate the cached frame.
+
+    With a ``shared`` store (see tourism.sharedcache), misses are looked up
+    there and new values written through to it, so other server processes
+    on the host can use them.
+    """
+
+    def __init__(self, ttl=6 * 3600, max_entries=256, max_bytes=256 * 1024 * 1024, shared=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._shared_hits = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                value = entry[1]
+                return value.copy() if isinstance(value, pd.DataFrame) else value
+        found = self.shared.get(key) if self.shared is not None else MISSING
+        with self._lock:
+            if found is MISSING:
+                self._misses += 1
+                return MISSING
+            self._hits += 1
+            self._shared_hits += 1
+        # A freshly unpickled value, so the caller may have it as is
+        value, ttl = found
+        self._store(key, value, ttl)
+        return value
+
+    def stale(self, key):
+        """The cached value for ``key`` even if it has expired, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._stale += 1
+                value = entry[1]
+                return value.copy() if isinstance(value, pd.DataFrame) else value
+        found = self.shared.get(key, stale=True) if self.shared is not None else MISSING
+        if found is MISSING:
+            return MISSING
+        with self._lock:
+            self._stale += 1
+        return found[0]
+
+    def put(self, key, value):
+        if self._store(key, value, self.ttl) and self.shared is not None:
+            self.shared.put(key, value, self.ttl)
+
+    def _store(self, key, value, ttl):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return False
+        if isinstance(value, pd.DataFrame):
+            value = value.copy()
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, predicate=None):
+        """Drop every entry, or only those whose key matches ``predicate``."""
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._pop(key)
+        if self.shared is not None:
+            self.shared.invalidate(predicate)
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "shared_hits": self._shared_hits,
+            } | ({"shared": self.shared.stats()} if self.shared is not None else {})
+
+    def _pop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+@st.cache_resource
+def get_query_cache():
+    from .config import CACHE_MAX_BYTES, CACHE_MAX_ENTRIES, CACHE_TTL
+    from .sharedcache import shared_store
+
+    return QueryCache(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES,
+                      shared=shared_store("queries"))
+
+
+def register_invalidation(hook, tables=None):
+    """Call ``hook()`` whenever the query cache is cleared.
+
+    With ``tables``, also call it when only one of those tables changed.
+    """
+    _invalidation_hooks.append((hook, frozenset(tables) if tables else None))
+    return hook
+
+
+def data_version(tables=None):
+    """Changes whenever the data (or, given ``tables``, any of those tables) is reloaded."""
+    if tables is None:
+        return _data_version
+    return tuple(_table_versions.get(table) for table in sorted(tables))
+
+
+def set_table_versions(versions):
+    """Record the backend's current {table: version}, read when the process starts."""
+    _table_versions.update((table.upper(), version) for table, version in versions.items())
+
+
+def invalidate_query_cache():
+    """Forget all cached results, e.g. after the warehouse has been reloaded."""
+    global _data_version
+    _data_version += 1
+    dropped = get_query_cache().invalidate()
+    for hook, _ in _invalidation_hooks:
+        hook()
+    return dropped
+
+
+def invalidate_tables(versions):
+    """Forget only the results and derived data that read the tables in ``versions``.
+
+    ``versions`` maps each changed table to its new version.
+    """
+    versions = {table.upper(): version for table, version in versions.items()}
+    tables = frozenset(versions)
+    dropped = get_query_cache().invalidate(lambda key: tables_of(key[0]) & tables)
+    for hook, hook_tables in _invalidation_hooks:
+        if hook_tables and hook_tables & tables:
+            hook()
+    # Updated last: a figure built under the new version must not find the
+    # old results or frames still cached
+    _table_versions.update(versions)
+    return dropped
@@ -0,0 +1,81 @@
+"""Render lists of cards as one Streamlit element per page.
+
+Both renderers are fragments, so turning a page reruns only the list.
+"""
+
+import html
+import math
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZE = 50
+
+_CARD = """<div style="
+    background-color: {background};
+    border: 2px solid #808000;
+    border-radius: 10px;
+    padding: 12px;
+    margin-bottom: 10px;
+    font-family: 'Georgia', serif;
+    color: #4b2e2e;">
+    <div style="font-size: 18px;">
+        {icon} <b>"""
+_TITLE_END = """</b>
+    </div>"""
+_SUBTITLE = """
+    <div style="font-size: 14px; color: #666666; margin-top: 4px;">
+        """
+_END = """
+    </div>"""
+_CARD_END = """
+</div>"""
+
+
+def _escaped(values):
+    return values.astype(object).fillna("").astype(str).map(html.escape)
+
+
+def _page(frame, key, page_size):
+    """Slice ``frame`` to the page picked with a pager (shown only if needed)."""
+    pages = math.ceil(len(frame) / page_size)
+    if pages <= 1:
+        return frame
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    return frame.iloc[(page - 1) * page_size:page * page_size]
+
+
+@st.fragment
+def render_cards(df, title, subtitle=None, icon="", background="#f0f8e0", key="cards",
+                 page_size=PAGE_SIZE):
+    """Show one card per row of ``df``, using columns ``title`` and ``subtitle``.
+
+    The HTML for a page is built with vectorized string operations and sent
+    as a single markdown element instead of one element per card.
+    """
+    df = _page(df, key, page_size)
+    if df.empty:
+        return
+    head = _CARD.format(background=background, icon=icon)
+    cards = head + _escaped(df[title]) + _TITLE_END
+    if subtitle is not None:
+        cards = cards + _SUBTITLE + _escaped(df[subtitle]) + _END
+    cards = cards + _CARD_END
+    st.markdown("\n".join(cards), unsafe_allow_html=True)
+
+
+@st.fragment
+def render_grouped_list(df, group, item, key="list", page_size=PAGE_SIZE):
+    """Show ``item`` values as bullets under a header for each ``group``.
+
+    Rows are shown in the order given, so ``df`` should be sorted by group.
+    """
+    items = _page(df[[group, item]].reset_index(drop=True), key, page_size)
+    if items.empty:
+        return
+    # Keep multi-line values (names with addresses) inside their bullet
+    bullets = "- " + items[item].str.replace(r"\s*\n\s*", "  \n  ", regex=True)
+    groups = items[group].astype(str)
+    new_group = groups.ne(groups.shift())
+    headers = pd.Series("", index=items.index).mask(new_group, "\n**🔹 " + groups + "**\n\n")
+    st.markdown("\n".join(headers + bullets))
@@ -0,0 +1,317 @@
+"""Every chart in the app, built from the shared data for one selected state.
+
+Chart functions take the state ("All" for every state), load what they need
+from the shared caches and return a Plotly figure, or None when there is
+nothing to plot. ``figure(chart, state)`` memoizes them per data version
+(see tourism.figures), so the app and the start-up warm-up (tourism.warmup)
+fill and read the same cache.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from . import queries
+from .config import AGGREGATION
+from .db import run_queries, run_query
+from .experiences import get_experience_data
+from .figures import cached_figure
+from .local import get_festival_data
+from .providers import get_provider_index
+from .states import STATE_IDS, encode_states, get_state_table
+from .units import to_lakh
+from .visits import get_visits
+
+# Charts that do not depend on the selected state are built once, for "All"
+STATELESS = {"fig_scheme", "fig_asi"}
+
+
+def figure(chart, state):
+    """The memoized figure of ``chart`` for ``state``, or None."""
+    if chart in STATELESS:
+        state = "All"
+    return cached_figure(chart, state, lambda: CHARTS[chart](state), TABLES[chart])
+
+
+# --- Festivals and Pilgrimage ---
+
+def festival_views(state):
+    """fairs/prashad summary and top-N frames of a state, amounts in lakh."""
+    # Aggregate the preloaded rows locally, or run the independent
+    # warehouse queries concurrently
+    if AGGREGATION == "local":
+        return get_festival_data().views(state)
+    # The tables keep their raw state names, so filter on every spelling
+    spellings = get_state_table().spellings(state)
+    tab1_data = run_queries({
+        "fairs_summary": queries.FAIRS_SUMMARY.bind(state=state, spellings=spellings),
+        "prashad_summary": queries.PRASHAD_SUMMARY.bind(state=state, spellings=spellings),
+        "fairs_top": queries.FAIRS_TOP.bind(state=state, spellings=spellings),
+        "prashad_top": queries.PRASHAD_TOP.bind(state=state, spellings=spellings),
+    })
+    # All amounts are shown in lakh; PRASHAD publishes its costs in crore
+    to_lakh(tab1_data["prashad_summary"], "PRASHAD", {"APPROVEDCOST": "AMOUNT_RELEASED_BY_GOV"})
+    to_lakh(tab1_data["prashad_top"], "PRASHAD", {"APPROVEDCOST": "AMOUNT"})
+    return tab1_data
+
+
+def fig_summary(state):
+    tab1_data = festival_views(state)
+    df_fairs_summary = tab1_data["fairs_summary"]
+    df_prashad_summary = tab1_data["prashad_summary"]
+    df_summary = pd.concat([df_fairs_summary, df_prashad_summary], ignore_index=True)
+
+    df_summary['SANCTIONYEAR'] = df_summary['SANCTIONYEAR'].astype(str)
+
+    fig_summary = px.bar(
+        df_summary,
+        x='SANCTIONYEAR',
+        y='AMOUNT_RELEASED_BY_GOV',
+        color='CATEGORY',
+        labels={
+            'SANCTIONYEAR': 'Sanction Year',
+            'AMOUNT_RELEASED_BY_GOV': 'Amount Released (in Lakhs)'
+        },
+        color_discrete_map={
+            'Pilgrimage': '#800000',
+            'Festival': '#F4A460'
+        }
+    )
+    fig_summary.update_layout(barmode='group', xaxis={'type': 'category'}, height=450)
+    return fig_summary
+
+
+def fig_fairs(state):
+    fig_fairs = px.bar(
+        festival_views(state)["fairs_top"].sort_values("AMOUNT", ascending=False),
+        x="AMOUNT", y="NAME", orientation="h",
+        labels={"AMOUNT": "₹ Funding (in lakh)", "NAME": "Festival"},
+        color_discrete_sequence=['#F4C430']
+    )
+    fig_fairs.update_layout(yaxis=dict(autorange="reversed"), margin=dict(t=40, b=40), height=400)
+    return fig_fairs
+
+
+def fig_prashad(state):
+    fig_prashad = px.bar(
+        festival_views(state)["prashad_top"].sort_values("AMOUNT", ascending=False),
+        x="AMOUNT", y="NAME", orientation="h",
+        labels={"AMOUNT": "₹ Approved Cost (in lakh)", "NAME": "Project"},
+        color_discrete_sequence=['#FF9933']
+    )
+    fig_prashad.update_layout(yaxis=dict(autorange="reversed"), margin=dict(t=40, b=40), height=400)
+    return fig_prashad
+
+
+def fig_treemap(state):
+    return px.treemap(
+        get_provider_index().treemap(state),
+        path=["STATE", "CATEGORY"],
+        values="NUMBER_OF_ORGANISATIONS",
+        color="STATE"
+    )
+
+
+# --- Experience & Adventure Sports ---
+
+def experience_rows(name, state):
+    """Rows of one experience table for a state (filtered on STATE_ID) or "All"."""
+    df = get_experience_data()[name]
+    if state == "All":
+        return df
+    return df[df["STATE_ID"] == STATE_IDS.get(state)]
+
+
+def fig_experiences(state):
+    df_exp = experience_rows("experiences", state)
+    if state == "All":
+        state_counts = df_exp.groupby('STATE', observed=True).size().reset_index(name='Number of Experiences')
+        return px.bar(state_counts, x='STATE', y='Number of Experiences',color_discrete_sequence=['#808000'],
+                      title="Experience Counts by State")
+    dest_counts = df_exp.groupby('DESTINATION', observed=True).size().reset_index(name='Number of Experiences')
+    if not dest_counts.empty and dest_counts["Number of Experiences"].sum() > 0:
+        return px.bar(dest_counts, x='DESTINATION', y='Number of Experiences',
+                      title=f"Experience Counts by Destination in {state}", color_discrete_sequence=['#808000'])
+
+
+def fig_peaks(state):
+    df_peaks = experience_rows("peaks", state)
+    peak_counts = df_peaks.groupby("STATE", observed=True).size().reset_index(name="Number of Peaks")
+    if state == "All":
+        return px.bar(peak_counts.sort_values("Number of Peaks", ascending=True),
+                      x="Number of Peaks", y="STATE", orientation="h",color_discrete_sequence=['#808000'],
+                      title="Number of Mountain Peaks by State")
+    if not peak_counts.empty and peak_counts["Number of Peaks"].sum() > 0:
+        return px.bar(peak_counts.sort_values("Number of Peaks", ascending=True),
+                      x="Number of Peaks", y="STATE", orientation="h",color_discrete_sequence=['#808000'],
+                      title=f"Mountain Peaks in {state}")
+
+
+def fig_tree(state):
+    df_peaks = experience_rows("peaks", state)
+    if state == "All" or df_peaks.empty:
+        return None
+    fig_tree = px.treemap(
+        df_peaks,
+        path=["SPORTS", "PEAKNAME"],
+        values=None,
+        custom_data=["HEIGHT"],
+        title=f"Treemap of Peaks by Sport in {state}",
+        color="HEIGHT",
+        color_continuous_scale="Viridis"
+    )
+    fig_tree.update_traces(
+        hovertemplate="<b>%{label}</b><br>Height: %{customdata[0]} m"
+    )
+    return fig_tree
+
+
+def fig3(state):
+    df_filtered = experience_rows("museum", state)
+    df_grouped = df_filtered.groupby(["STATE", "TYPE"], observed=True).size().reset_index(name="Museum_Count")
+
+    color_map = {
+        "Existing Museum": "#808000",
+        "New Museum": "#A0522D",
+        "Modernization of Museum": "#FFC0CB",
+        "Visitor Experience Management": "#CC7722"
+    }
+
+    if not df_grouped.empty and df_grouped["Museum_Count"].sum() > 0:
+        return px.bar(
+            df_grouped,
+            x="STATE",
+            y="Museum_Count",
+            color="TYPE",
+            barmode="group",
+            title=f"Number of Museums by State and Type funded by GOI in recent years ({state})" if state != "All" else "Number of Museums by State and Type",
+            labels={"Museum_Count": "Number of Museums", "STATE": "State", "TYPE": "Museum Type"},
+            color_discrete_map=color_map
+        )
+
+
+# --- Stats ---
+
+def _visits(kind, state):
+    df_long = get_visits().rows(kind, state).astype({"YEAR": str})
+    return px.line(df_long, x="YEAR", y="VISITS", color="STATE",
+                   labels={"YEAR": "Year", "VISITS": "Visits", "STATE": "STATES"},
+                   title=f"{kind} Tourist Visits ({state})" if state != "All" else f"{kind} Tourist Visits (All States)")
+
+
+def fig_dtv(state):
+    return _visits("Domestic", state)
+
+
+def fig_ftv(state):
+    return _visits("Foreign", state)
+
+
+def fig_art(state):
+    df_art = encode_states(run_query(queries.ART_CULTURE))
+
+    if state != "All":
+        df_art = df_art[df_art["STATE_ID"] == STATE_IDS.get(state)]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Org 2018"], name="Orgs 2018", marker_color="#808000"))
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Org 2019"], name="Orgs 2019", marker_color="#A0522D"))
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Org 2020"], name="Orgs 2020", marker_color="#D2691E"))
+
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Amt 2018"], name="Amt 2018", marker_color="#D2B48C"))
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Amt 2019"], name="Amt 2019", marker_color="#F5DEB3"))
+    fig.add_trace(go.Bar(x=df_art["STATE"], y=df_art["Amt 2020"], name="Amt 2020", marker_color="#FFDAB9"))
+
+    fig.update_layout(
+        barmode='group',
+        title="🎭 Govt Spending in Art & Culture Organizations (2018-2020) across States",
+        xaxis_title="State",
+        yaxis_title="Count / ₹ (in lakh)",
+        legend_title="Metric",
+        height=600
+    )
+    return fig
+
+
+def fig_scheme(state):
+    df_scheme = run_query(queries.ART_SCHEME_FUNDING)
+
+    # Melt for easier plotting
+    df_long = df_scheme.melt(id_vars="SCHEME",
+                             value_vars=queries.SCHEME_YEARS,
+                             var_name="Year",
+                             value_name="Funding")
+
+    # Create grouped bar chart
+    return px.bar(
+        df_long,
+        x="SCHEME",
+        y="Funding",
+        color="Year",
+        barmode="group",
+        title="🎨 GOI Funding by Scheme (2019–2023) in art & culture",
+        labels={"Funding": "Funding (₹ in lakh)"},
+        color_discrete_sequence=px.colors.sequential.Aggrnyl
+    )
+
+
+def fig_asi(state):
+    df_asi = run_query(queries.ASI_FUNDING)
+
+    # Melt and filter only expenditure
+    df_asi_long = df_asi.melt(id_vars="YEAR",
+                              value_vars=["EXPENDITURE"],
+                              var_name="Type",
+                              value_name="Amount")
+
+    # Plot only expenditure
+    return px.line(
+        df_asi_long,
+        x="YEAR",
+        y="Amount",
+        markers=True,
+        title="🏛️ ASI Expenditure on Preservation of Monuments (2019–2024)",
+        labels={"Amount": "₹ in lakh", "YEAR": "Year"},
+        color_discrete_sequence=["#CD5C5C"]
+    )
+
+
+CHARTS = {
+    chart.__name__: chart
+    for chart in (
+        fig_summary, fig_fairs, fig_prashad, fig_treemap,
+        fig_experiences, fig_peaks, fig_tree, fig3,
+        fig_dtv, fig_ftv, fig_art, fig_scheme, fig_asi,
+    )
+}
+
+_FESTIVALS = queries.FAIRS_ROWS.tables | queries.PRASHAD_ROWS.tables
+_VISITS = queries.VISITS_2016_18.tables | queries.VISITS_2019_21.tables
+
+# Tables each chart is built from, so reloading one rebuilds only its charts
+TABLES = {
+    "fig_summary": _FESTIVALS,
+    "fig_fairs": _FESTIVALS,
+    "fig_prashad": _FESTIVALS,
+    "fig_treemap": queries.PROVIDER_ROWS.tables,
+    "fig_experiences": queries.EXPERIENCES.tables,
+    "fig_peaks": queries.PEAKS.tables,
+    "fig_tree": queries.PEAKS.tables,
+    "fig3": queries.MUSEUMS.tables,
+    "fig_dtv": _VISITS,
+    "fig_ftv": _VISITS,
+    "fig_art": queries.ART_CULTURE.tables,
+    "fig_scheme": queries.ART_SCHEME_FUNDING.tables,
+    "fig_asi": queries.ASI_FUNDING.tables,
+}
+
+# Charts of each section, with the states its selector offers
+SECTIONS = {
+    "festivals": (lambda: get_state_table().names("festivals"),
+                  ["fig_summary", "fig_fairs", "fig_prashad", "fig_treemap"]),
+    "experiences": (lambda: get_state_table().names("experiences"),
+                    ["fig_experiences", "fig_peaks", "fig_tree", "fig3"]),
+    "stats": (lambda: get_visits().states,
+              ["fig_dtv", "fig_ftv", "fig_art", "fig_scheme", "fig_asi"]),
+}
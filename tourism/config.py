@@ -0,0 +1,71 @@
+"""Runtime settings, read from ``TOURISM_*`` environment variables."""
+
+import os
+
+import streamlit as st
+
+# "snowflake" queries the warehouse; "local" serves the same tables from an
+# embedded DuckDB database loaded from data/*.csv (no credentials needed);
+# "snapshot" serves them from the Parquet files written by tourism.snapshot.
+BACKEND = os.environ.get("TOURISM_BACKEND", "snowflake")
+SNAPSHOT_DIR = os.environ.get(
+    "TOURISM_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "snapshot")
+)
+
+# Snowpark sessions kept open per server process; also bounds how many
+# queries a single rerun runs concurrently.
+SESSION_POOL_SIZE = int(os.environ.get("TOURISM_SESSION_POOL_SIZE", 4))
+# Waiting this long for a pooled session is logged as a warning.
+SLOW_SESSION_WAIT_MS = float(os.environ.get("TOURISM_SLOW_SESSION_WAIT_MS", 500))
+
+# Seconds between polls of every table's version (tourism.watermarks); a
+# changed table drops only what was derived from it. 0 turns polling off (the
+# versions are still read once at start).
+WATERMARK_INTERVAL = float(os.environ.get("TOURISM_WATERMARK_INTERVAL", 300))
+
+# Query result cache. The source data only changes a few times a year, and
+# with watermarks on the TTL is only a backstop.
+CACHE_TTL = int(os.environ.get("TOURISM_CACHE_TTL", 7 * 24 * 3600 if WATERMARK_INTERVAL else 6 * 3600))
+CACHE_MAX_ENTRIES = int(os.environ.get("TOURISM_CACHE_MAX_ENTRIES", 256))
+CACHE_MAX_BYTES = int(os.environ.get("TOURISM_CACHE_MAX_MB", 256)) * 1024 * 1024
+
+# Warehouse queries running at once per process, across all sessions. A query
+# that waits longer than TOURISM_QUERY_WAIT_S for a slot is answered from its
+# expired cached result when there is one.
+MAX_CONCURRENT_QUERIES = int(os.environ.get("TOURISM_MAX_CONCURRENT_QUERIES", SESSION_POOL_SIZE))
+QUERY_WAIT_S = float(os.environ.get("TOURISM_QUERY_WAIT_S", 2))
+
+# SQLite file caching query results and figures for every server process on
+# the host (tourism.sharedcache), trimmed to TOURISM_SHARED_CACHE_MB.
+# Unset keeps each process's caches to itself.
+SHARED_CACHE = os.environ.get("TOURISM_SHARED_CACHE", "")
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("TOURISM_SHARED_CACHE_MB", 512)) * 1024 * 1024
+
+# Built Plotly figures kept per (chart, state); see tourism.figures.
+FIGURE_CACHE_ENTRIES = int(os.environ.get("TOURISM_FIGURE_CACHE_ENTRIES", 512))
+
+# Query instrumentation (see tourism.querylog): the QUERY_TAG "app" field,
+# how many recent queries the admin panel keeps, and the slow-query threshold.
+QUERY_TAG_APP = os.environ.get("TOURISM_QUERY_TAG", "indian-tourism")
+QUERY_LOG_SIZE = int(os.environ.get("TOURISM_QUERY_LOG_SIZE", 500))
+SLOW_QUERY_MS = float(os.environ.get("TOURISM_SLOW_QUERY_MS", 1000))
+
+# Precompute every chart for every state at server start (tourism.warmup):
+# "background", "blocking" (the first session waits) or "off"; the warm-up
+# stops after TOURISM_WARMUP_BUDGET seconds.
+WARMUP = os.environ.get("TOURISM_WARMUP", "background")
+WARMUP_BUDGET = float(os.environ.get("TOURISM_WARMUP_BUDGET", 120))
+
+# "lazy" renders only the selected section; "tabs" runs all three behind st.tabs.
+NAVIGATION = os.environ.get("TOURISM_NAVIGATION", "lazy")
+
+# "local" loads the tab1 tables once and aggregates per state in pandas;
+# "warehouse" sends the per-state aggregate queries to Snowflake.
+AGGREGATION = os.environ.get("TOURISM_AGGREGATION", "local")
+
+# Opening the app with ``?admin=<token>`` shows the admin sidebar.
+ADMIN_TOKEN = os.environ.get("TOURISM_ADMIN_TOKEN")
+
+
+def is_admin():
+    return bool(ADMIN_TOKEN) and st.query_params.get("admin") == ADMIN_TOKEN
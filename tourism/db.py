@@ -0,0 +1,93 @@
+"""Single entry point for every warehouse query the app runs.
+
+Cache misses are coordinated across all sessions of the process: identical
+queries in flight at the same time run once and share the result, and at
+most ``MAX_CONCURRENT_QUERIES`` reach the backend at once. A query that
+cannot get a slot within ``QUERY_WAIT_S`` is answered from its expired
+cached result if there is one, and otherwise keeps waiting.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .backends import get_backend
+from .cache import MISSING, get_query_cache, make_key
+from .config import MAX_CONCURRENT_QUERIES, QUERY_WAIT_S, SESSION_POOL_SIZE
+from .queries import BoundQuery, Query
+from .querylog import get_query_log, query_tag
+from .singleflight import SingleFlight
+from .timing import timed
+
+_executor = ThreadPoolExecutor(max_workers=SESSION_POOL_SIZE, thread_name_prefix="query")
+_flights = SingleFlight()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT_QUERIES)
+
+
+def run_query(query):
+    name, sql, params = _split(query)
+    return _run(name, sql, params, get_query_cache(), get_backend(), get_query_log())
+
+
+def run_queries(queries):
+    """Run independent queries concurrently and wait for all of them.
+
+    ``queries`` maps a name to a bound query (or a parameterless ``Query``);
+    the result maps the same names to DataFrames. Cache hits are served
+    inline, only misses are sent to the worker threads.
+    """
+    cache, backend, log = get_query_cache(), get_backend(), get_query_log()
+    results, futures = {}, {}
+    for name, query in queries.items():
+        query_name, sql, params = _split(query)
+        start = time.perf_counter()
+        df = cache.get(make_key(sql, params))
+        if df is not MISSING:
+            log.add(query_name, backend.name, df, time.perf_counter() - start, cache_hit=True)
+            results[name] = df
+        else:
+            futures[name] = _executor.submit(_run, query_name, sql, params, cache, backend, log)
+    for name, future in futures.items():
+        results[name] = future.result()
+    return results
+
+
+def _split(query):
+    """(name, sql, params) of a Query, BoundQuery or plain SQL string."""
+    if isinstance(query, Query):
+        query = query.bind()
+    if isinstance(query, BoundQuery):
+        return query.name, query.sql, query.params
+    return "sql", query, ()
+
+
+def _run(name, sql, params, cache, backend, log):
+    key = make_key(sql, params)
+    start = time.perf_counter()
+    df = cache.get(key)
+    if df is not MISSING:
+        log.add(name, backend.name, df, time.perf_counter() - start, cache_hit=True)
+        return df
+    df, shared = _flights.do(key, lambda: _execute(name, sql, params, key, cache, backend, log))
+    if shared:
+        log.add(name, backend.name, df, time.perf_counter() - start, cache_hit=True)
+    # Every waiter gets the same frame and callers may modify theirs
+    return df.copy()
+
+
+def _execute(name, sql, params, key, cache, backend, log):
+    start = time.perf_counter()
+    if not _slots.acquire(timeout=QUERY_WAIT_S):
+        df = cache.stale(key)
+        if df is not MISSING:
+            log.add(name, backend.name, df, time.perf_counter() - start, cache_hit=True, stale=True)
+            return df
+        _slots.acquire()
+    try:
+        with timed(f"query:{name}"):
+            df, query_id = backend.execute(sql, params or None, tag=query_tag(name))
+    finally:
+        _slots.release()
+    log.add(name, backend.name, df, time.perf_counter() - start, cache_hit=False, query_id=query_id)
+    cache.put(key, df)
+    return df
@@ -0,0 +1,140 @@
+"""Load the data.gov.in CSVs in ``data/`` into the Snowflake warehouse.
+
+    python -m tourism.etl [--force] [--chunksize N] [TABLE ...]
+
+Each CSV is streamed in chunks, cleaned (totals and repeated header rows
+dropped, states mapped onto the canonical dimension with their integer
+``STATE_ID``) and bulk-loaded with ``write_pandas``
+into a staging table that is then swapped in, so readers never see a
+half-loaded table. Files whose SHA-256 matches the last successful load,
+recorded in ``ETL_MANIFEST``, are skipped. The dimension itself is loaded
+as ``STATE_DIM``.
+"""
+
+import argparse
+import hashlib
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from .sources import DATA_DIR, NON_STATE_VALUES, SOURCES, read_source
+from .states import encode_states, state_dimension
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_TABLE = "ETL_MANIFEST"
+STATE_DIM_TABLE = "STATE_DIM"
+CHUNKSIZE = 10_000
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def clean_chunk(chunk):
+    """Drop totals/header rows and map states to the dimension in one CSV chunk."""
+    state = "STATES" if "STATES" in chunk.columns else "STATE"
+    text = chunk.select_dtypes(include=["object", "string"]).columns
+    chunk[text] = chunk[text].apply(lambda column: column.str.strip())
+    marker = chunk[state].str.lower().isin(NON_STATE_VALUES)
+    if "SLNO" in chunk.columns:
+        marker |= chunk["SLNO"].astype(str).str.strip().str.lower().eq("total")
+    chunk = chunk[~marker & chunk[state].notna()].copy()
+    encode_states(chunk, state)
+    if "SLNO" in chunk.columns:
+        chunk["SLNO"] = pd.to_numeric(chunk["SLNO"], errors="coerce").astype("Int64")
+    return chunk
+
+
+class SnowflakeTarget:
+    def __init__(self, session):
+        self.session = session
+        session.sql(f"""
+            CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                TABLE_NAME VARCHAR, FILE_NAME VARCHAR, SHA256 VARCHAR,
+                ROW_COUNT NUMBER, LOADED_AT TIMESTAMP_LTZ
+            )
+        """).collect()
+
+    def last_digest(self, table):
+        rows = self.session.sql(
+            f"SELECT SHA256 FROM {MANIFEST_TABLE} WHERE TABLE_NAME = ? ORDER BY LOADED_AT DESC LIMIT 1",
+            params=[table],
+        ).collect()
+        return rows[0]["SHA256"] if rows else None
+
+    def replace_table(self, table, chunks):
+        staging = f"{table}__STAGING"
+        rows = 0
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            self.session.write_pandas(
+                chunk, staging, auto_create_table=True, overwrite=(rows == 0), use_logical_type=True
+            )
+            rows += len(chunk)
+        if rows == 0:
+            raise ValueError(f"No rows left to load into {table} after cleaning")
+        self.session.sql(f"CREATE TABLE IF NOT EXISTS {table} LIKE {staging}").collect()
+        self.session.sql(f"ALTER TABLE {table} SWAP WITH {staging}").collect()
+        self.session.sql(f"DROP TABLE {staging}").collect()
+        return rows
+
+    def record(self, table, file_name, digest, rows):
+        self.session.sql(
+            f"INSERT INTO {MANIFEST_TABLE} SELECT ?, ?, ?, ?, CURRENT_TIMESTAMP()",
+            params=[table, file_name, digest, rows],
+        ).collect()
+
+
+def _load(target, table, file_name, digest, chunks, force):
+    if not force and target.last_digest(table) == digest:
+        logger.info("%s unchanged, skipping", file_name)
+        return None
+    rows = target.replace_table(table, chunks)
+    target.record(table, file_name, digest, rows)
+    logger.info("Loaded %d rows from %s into %s", rows, file_name, table)
+    return rows
+
+
+def run(target, data_dir=DATA_DIR, tables=None, force=False, chunksize=CHUNKSIZE):
+    """Load every source (or only ``tables``); returns {table: rows or None if skipped}."""
+    loaded = {}
+    if not tables or STATE_DIM_TABLE in tables:
+        dimension = state_dimension()
+        digest = hashlib.sha256(dimension.to_csv(index=False).encode()).hexdigest()
+        loaded[STATE_DIM_TABLE] = _load(target, STATE_DIM_TABLE, "tourism/states.py", digest,
+                                        [dimension], force)
+    for source in SOURCES:
+        if tables and source.table not in tables:
+            continue
+        digest = file_digest(Path(data_dir) / source.file)
+        chunks = (clean_chunk(chunk) for chunk in read_source(source, data_dir, chunksize=chunksize))
+        loaded[source.table] = _load(target, source.table, source.file, digest, chunks, force)
+    return loaded
+
+
+def main(argv=None):
+    from .session import get_session_pool
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tables", nargs="*", help="only load these tables")
+    parser.add_argument("--force", action="store_true", help="reload even if the file is unchanged")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    with get_session_pool().session() as session:
+        loaded = run(SnowflakeTarget(session), tables=set(args.tables), force=args.force,
+                     chunksize=args.chunksize)
+    for table, rows in loaded.items():
+        print(f"{table:<28} {'unchanged' if rows is None else f'{rows} rows'}")
+
+
+if __name__ == "__main__":
+    main()
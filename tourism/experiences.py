@@ -0,0 +1,35 @@
+"""Experience & Adventure Sports tables, loaded once and keyed by STATE_ID."""
+
+import streamlit as st
+
+from . import queries
+from .cache import register_invalidation
+from .config import CACHE_TTL
+from .db import run_queries
+from .frames import compact
+from .states import encode_states
+from .timing import timed
+
+EXPERIENCE_QUERIES = {
+    "experiences": queries.EXPERIENCES,
+    "peaks": queries.PEAKS,
+    "museum": queries.MUSEUMS,
+    "unesco": queries.UNESCO,
+    "rsm": queries.RSM,
+    "untraceable": queries.UNTRACEABLE,
+}
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def get_experience_data():
+    """{name: frame} with canonical STATE names and a STATE_ID column.
+
+    The frames are compact and shared by every session (see tourism.frames).
+    """
+    data = run_queries(EXPERIENCE_QUERIES)
+    with timed("transform"):
+        return {name: compact(encode_states(frame)) for name, frame in data.items()}
+
+
+register_invalidation(get_experience_data.clear,
+                      frozenset().union(*(query.tables for query in EXPERIENCE_QUERIES.values())))
@@ -0,0 +1,52 @@
+"""Built Plotly figures, memoized per (chart, state, version of its tables).
+
+Building a Plotly Express figure costs tens of milliseconds per chart;
+``st.plotly_chart`` only needs to serialize a built one. Figures are kept
+as objects rather than JSON because Streamlit validates a figure passed as
+a dict all over again.
+"""
+
+import streamlit as st
+
+from .cache import MISSING, QueryCache, data_version, register_invalidation
+from .config import CACHE_TTL, FIGURE_CACHE_ENTRIES
+from .sharedcache import shared_store
+from .singleflight import SingleFlight
+from .timing import timed
+
+# Sessions (and the warm-up) asking for the same missing figure build it once
+_flights = SingleFlight()
+
+
+@st.cache_resource
+def get_figure_cache():
+    return QueryCache(ttl=CACHE_TTL, max_entries=FIGURE_CACHE_ENTRIES, shared=shared_store("figures"))
+
+
+def cached_figure(chart, state, build, tables=None):
+    """Return ``build()`` for ``chart`` and ``state``, building it once per data version.
+
+    With ``tables`` (the tables the figure is built from), only reloading
+    one of those tables rebuilds it; figures of older versions are no
+    longer looked up and age out of the cache.
+
+    ``build`` does the aggregation as well as the figure, so a cached view
+    skips both. It may return None for "nothing to plot". The returned
+    figure is shared by every session and must not be modified.
+    """
+    cache = get_figure_cache()
+    key = (chart, state, data_version(tables))
+    figure = cache.get(key)
+    if figure is MISSING:
+        figure, _ = _flights.do(key, lambda: _build(cache, key, build))
+    return figure
+
+
+def _build(cache, key, build):
+    with timed("figure"):
+        figure = build()
+    cache.put(key, figure)
+    return figure
+
+
+register_invalidation(lambda: get_figure_cache().invalidate())
@@ -0,0 +1,55 @@
+"""Compact representation for the frames shared by every session.
+
+Frames held by ``st.cache_resource`` are a single copy for the whole server.
+``compact`` shrinks them: state columns become categoricals over the
+canonical state list (one dictionary shared by every frame), other text
+columns with few distinct values become categoricals, and numeric columns
+are downcast where no value changes. Frames are shared, so they are
+treated as read-only: callers filter, select or group them, and copy
+before assigning to a column.
+"""
+
+import pandas as pd
+
+from .states import STATES
+
+# Ordered, so that plotly can aggregate them (e.g. the max in treemap paths)
+STATE_DTYPE = pd.CategoricalDtype(STATES, ordered=True)
+STATE_COLUMNS = ("STATE", "STATES")
+CATEGORICAL_COLUMNS = ("CATEGORY", "TYPE", "SPORTS", "SCHEME")
+
+
+def _state_categorical(values):
+    extra = sorted(set(values.dropna()) - set(STATES))
+    if extra:
+        return values.astype(pd.CategoricalDtype(STATES + extra, ordered=True))
+    return values.astype(STATE_DTYPE)
+
+
+def _downcast(values):
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast="integer")
+    if pd.api.types.is_float_dtype(values):
+        smaller = values.astype("float32")
+        if smaller.astype(values.dtype).equals(values):
+            return smaller
+    return values
+
+
+def compact(df, categorical=CATEGORICAL_COLUMNS):
+    """Return ``df`` with categorical text columns and downcast numbers."""
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column in STATE_COLUMNS and not isinstance(values.dtype, pd.CategoricalDtype):
+            columns[column] = _state_categorical(values)
+        elif (column in categorical and not isinstance(values.dtype, pd.CategoricalDtype)
+              and values.nunique() <= len(values) // 2):
+            categories = sorted(values.dropna().unique())
+            columns[column] = values.astype(pd.CategoricalDtype(categories, ordered=True))
+        else:
+            columns[column] = _downcast(values)
+    return pd.DataFrame(columns, index=df.index)
+
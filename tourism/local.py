@@ -0,0 +1,120 @@
+"""Local aggregation: load the small tab1 tables once and aggregate in pandas."""
+
+import pandas as pd
+import streamlit as st
+
+from . import queries
+from .cache import register_invalidation
+from .config import CACHE_TTL
+from .db import run_queries
+from .frames import compact
+from .states import encode_states
+from .timing import timed
+from .units import to_lakh
+
+TOP_N = 6
+
+
+class FestivalData:
+    """Fairs and PRASHAD funding rows, aggregated per state.
+
+    Every tab1 view is pre-aggregated once per data load, for each state and
+    for "All". ``views(state)`` then only copies the precomputed frames; they
+    have the same names and columns as the per-state warehouse queries, with
+    all amounts in lakh.
+    """
+
+    def __init__(self, fairs, prashad):
+        fairs = compact(encode_states(to_lakh(fairs, "FAIRSANDCARNIVALSBYSTATE")))
+        prashad = compact(encode_states(to_lakh(prashad, "PRASHAD")))
+        self.fairs = fairs
+        self.prashad = prashad
+        states = pd.concat([prashad, fairs]).dropna(subset=["STATE_ID"])["STATE"]
+        self.states = sorted(states.unique().tolist())
+        self._rollups = self._build_rollups()
+
+    def views(self, state):
+        with timed("transform"):
+            rollup = self._rollups.get(state)
+            if rollup is None:
+                rollup = {name: frame.iloc[0:0] for name, frame in self._rollups["All"].items()}
+            return {name: frame.copy() for name, frame in rollup.items()}
+
+    def _build_rollups(self):
+        views = {
+            "fairs_summary": (fairs_summary, self.fairs),
+            "prashad_summary": (prashad_summary, self.prashad),
+            "fairs_top": (fairs_top, self.fairs),
+            "prashad_top": (prashad_top, self.prashad),
+        }
+        rollups = {state: {} for state in ["All"] + self.states}
+        for name, (aggregate, frame) in views.items():
+            rollups["All"][name] = aggregate(frame)
+            # One grouped pass over all states, then split the result by state
+            per_state = aggregate(frame, by=["STATE"])
+            columns = rollups["All"][name].columns
+            empty = per_state.iloc[0:0][columns]
+            parts = dict(tuple(per_state.groupby("STATE", sort=False, observed=True)))
+            for state in self.states:
+                part = parts.get(state, empty)
+                rollups[state][name] = part[columns].reset_index(drop=True)
+        return rollups
+
+
+def _summary(frame, amount, category, by):
+    grouped = frame.groupby(by + ["SANCTIONYEAR"], observed=True)[amount]
+    return pd.DataFrame({
+        "AMOUNT_RELEASED_BY_GOV": grouped.sum(min_count=1),
+        "PROJECT_OR_FESTIVAL_COUNT": grouped.size(),
+        "CATEGORY": category,
+    }).reset_index()
+
+
+def _top(frame, keys, amount, by):
+    totals = (
+        frame.groupby(by + keys, observed=True)[amount].sum(min_count=1)
+        .rename("AMOUNT")
+        .reset_index()
+        .sort_values("AMOUNT", ascending=False)
+    )
+    top = totals.groupby(by, observed=True).head(TOP_N) if by else totals.head(TOP_N)
+    return top.reset_index(drop=True)
+
+
+def fairs_summary(fairs, by=()):
+    return _summary(fairs, "AMOUNTRELEASED", "Festival", list(by))
+
+
+def prashad_summary(prashad, by=()):
+    keep = (
+        ~prashad["PROJECTNAME"].str.contains("total", case=False, na=True)
+        & prashad["SANCTIONYEAR"].notna()
+        & (prashad["SANCTIONYEAR"] != "Total")
+    )
+    return _summary(prashad[keep], "APPROVEDCOST", "Pilgrimage", list(by))
+
+
+def fairs_top(fairs, by=()):
+    # The warehouse query groups by STATE too, so it is part of the result
+    keys = ["NAMEOFFAIRS"] if by else ["STATE", "NAMEOFFAIRS"]
+    return _top(fairs, keys, "AMOUNTRELEASED", list(by)).rename(columns={"NAMEOFFAIRS": "NAME"})
+
+
+def prashad_top(prashad, by=()):
+    keep = ~prashad["PROJECTNAME"].str.lower().str.contains("total", regex=False, na=True)
+    return _top(prashad[keep], ["PROJECTNAME"], "APPROVEDCOST", list(by)).rename(
+        columns={"PROJECTNAME": "NAME"}
+    )
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def get_festival_data():
+    data = run_queries({
+        "fairs": queries.FAIRS_ROWS,
+        "prashad": queries.PRASHAD_ROWS,
+    })
+    with timed("transform"):
+        return FestivalData(data["fairs"], data["prashad"])
+
+
+register_invalidation(get_festival_data.clear, queries.FAIRS_ROWS.tables | queries.PRASHAD_ROWS.tables)
@@ -0,0 +1,70 @@
+"""Approved travel providers, loaded once and indexed by state."""
+
+import pandas as pd
+import streamlit as st
+
+from . import queries
+from .cache import register_invalidation
+from .config import CACHE_TTL
+from .db import run_query
+from .frames import compact
+from .states import encode_states
+from .timing import timed
+
+
+class ProviderIndex:
+    """Treemap counts and sorted organisation lists per state.
+
+    Everything is computed when the index is built, so each lookup only
+    copies the rows it returns.
+    """
+
+    def __init__(self, providers):
+        providers = compact(encode_states(providers.copy()))
+
+        # COUNT(ORGANISATION) semantics: non-null rows, duplicates included
+        counts = (
+            providers.groupby(["STATE", "CATEGORY"], observed=True)["ORGANISATION"].count()
+            .rename("NUMBER_OF_ORGANISATIONS")
+            .reset_index()
+            .sort_values("NUMBER_OF_ORGANISATIONS", ascending=False, kind="stable")
+            .reset_index(drop=True)
+        )
+        details = (
+            providers[["STATE", "CATEGORY", "ORGANISATION"]].dropna().drop_duplicates()
+            .sort_values(["STATE", "CATEGORY", "ORGANISATION"])
+            .reset_index(drop=True)
+        )
+        self._treemap = {"All": counts}
+        self._treemap.update(
+            (state, frame.reset_index(drop=True))
+            for state, frame in counts.groupby("STATE", observed=True)
+        )
+        self._details = {
+            state: frame[["CATEGORY", "ORGANISATION"]].reset_index(drop=True)
+            for state, frame in details.groupby("STATE", observed=True)
+        }
+
+    def treemap(self, state):
+        """STATE, CATEGORY, NUMBER_OF_ORGANISATIONS for one state or "All"."""
+        frame = self._treemap.get(state)
+        if frame is None:
+            frame = self._treemap["All"].iloc[0:0]
+        return frame.copy()
+
+    def details(self, state):
+        """CATEGORY, ORGANISATION rows of a state, sorted and de-duplicated."""
+        frame = self._details.get(state)
+        if frame is None:
+            return pd.DataFrame(columns=["CATEGORY", "ORGANISATION"])
+        return frame.copy()
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def get_provider_index():
+    providers = run_query(queries.PROVIDER_ROWS)
+    with timed("transform"):
+        return ProviderIndex(providers)
+
+
+register_invalidation(get_provider_index.clear, queries.PROVIDER_ROWS.tables)
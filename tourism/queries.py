@@ -0,0 +1,195 @@
+"""Named SQL templates for every query the app runs.
+
+Templates use ``:name`` bind parameters instead of f-string interpolation, so
+the SQL text of a logical query never changes with the selected state. The
+warehouse can then reuse its plan and result cache across users, and state
+names are never spliced into SQL.
+"""
+
+import re
+from typing import NamedTuple
+
+from .cache import normalize_sql, tables_of
+
+_PARAM = re.compile(r"(?<!:):([a-z_]+)\b")
+
+
+class BoundQuery(NamedTuple):
+    name: str
+    sql: str
+    params: tuple
+
+
+class Query:
+    def __init__(self, name, template):
+        self.name = name
+        self.params = tuple(_PARAM.findall(template))
+        self.sql = normalize_sql(_PARAM.sub("?", template))
+        self.tables = tables_of(self.sql)
+        self._template = template
+
+    def bind(self, **values):
+        if not any(isinstance(value, (list, tuple)) for value in values.values()):
+            return BoundQuery(self.name, self.sql, tuple(values[p] for p in self.params))
+        # A list binds one placeholder per item, e.g. for ``IN (:names)``;
+        # an empty one binds NULL, which matches nothing
+        values = {
+            name: (tuple(value) or (None,)) if isinstance(value, (list, tuple)) else (value,)
+            for name, value in values.items()
+        }
+        sql = _PARAM.sub(lambda match: ", ".join("?" * len(values[match.group(1)])), self._template)
+        return BoundQuery(self.name, normalize_sql(sql), tuple(v for p in self.params for v in values[p]))
+
+    def __repr__(self):
+        return f"Query({self.name!r})"
+
+
+def select(name, table, columns, where=()):
+    """Query reading only ``columns`` of ``table``, filtered by ``where``.
+
+    Views declare the columns they use instead of ``SELECT *``, so the
+    warehouse only sends those.
+    """
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return Query(name, sql)
+
+
+# A ``:state`` filter of 'All' matches every state; otherwise the rows whose
+# raw STATE is one of ``:spellings``, the names that map to that state in
+# the warehouse tables (see StateTable.spellings).
+STATE_FILTER = "(:state = 'All' OR STATE IN (:spellings))"
+
+# Raw state names with data in each section, mapped onto the state
+# dimension in pandas (see tourism.states)
+STATE_NAMES = Query("state_names", """
+    SELECT 'festivals' AS SECTION, STATE FROM PRASHAD WHERE STATE <> 'Total'
+    UNION
+    SELECT 'festivals', STATE FROM FAIRSANDCARNIVALSBYSTATE
+    UNION
+    SELECT 'festivals', STATE FROM TRAVELPROVIDERS WHERE STATE <> 'State'
+    UNION
+    SELECT 'experiences', STATE FROM SANCTIONEDPROJECTS23TO25 WHERE STATE <> 'Total'
+    UNION
+    SELECT 'experiences', STATE FROM MOUNTAINSPORTS WHERE STATE <> 'State'
+""")
+
+# --- Festivals and Pilgrimage ---
+
+FAIRS_SUMMARY = Query("fairs_summary", f"""
+    SELECT SANCTIONYEAR,
+           SUM(AMOUNTRELEASED) AS AMOUNT_RELEASED_BY_GOV,
+           COUNT(*) AS PROJECT_OR_FESTIVAL_COUNT,
+           'Festival' AS CATEGORY
+    FROM FAIRSANDCARNIVALSBYSTATE
+    WHERE {STATE_FILTER}
+    GROUP BY SANCTIONYEAR
+""")
+
+PRASHAD_SUMMARY = Query("prashad_summary", f"""
+    SELECT SANCTIONYEAR,
+           SUM(APPROVEDCOST) AS AMOUNT_RELEASED_BY_GOV,
+           COUNT(*) AS PROJECT_OR_FESTIVAL_COUNT,
+           'Pilgrimage' AS CATEGORY
+    FROM PRASHAD
+    WHERE {STATE_FILTER}
+      AND PROJECTNAME NOT ILIKE '%total%' AND SANCTIONYEAR != 'Total'
+    GROUP BY SANCTIONYEAR
+""")
+
+FAIRS_TOP = Query("fairs_top", f"""
+    SELECT STATE, NAMEOFFAIRS AS NAME, SUM(AMOUNTRELEASED) AS AMOUNT
+    FROM FAIRSANDCARNIVALSBYSTATE
+    WHERE {STATE_FILTER}
+    GROUP BY STATE, NAMEOFFAIRS
+    ORDER BY AMOUNT DESC
+    LIMIT 6
+""")
+
+PRASHAD_TOP = Query("prashad_top", f"""
+    SELECT PROJECTNAME AS NAME, SUM(APPROVEDCOST) AS AMOUNT
+    FROM PRASHAD
+    WHERE {STATE_FILTER} AND lower(PROJECTNAME) NOT LIKE '%total%'
+    GROUP BY PROJECTNAME
+    ORDER BY AMOUNT DESC
+    LIMIT 6
+""")
+
+# Whole tables, aggregated or indexed locally
+FAIRS_ROWS = Query("fairs_rows", """
+    SELECT STATE, NAMEOFFAIRS, SANCTIONYEAR, AMOUNTRELEASED FROM FAIRSANDCARNIVALSBYSTATE
+""")
+
+PRASHAD_ROWS = Query("prashad_rows", """
+    SELECT STATE, PROJECTNAME, SANCTIONYEAR, APPROVEDCOST FROM PRASHAD
+""")
+
+PROVIDER_ROWS = Query("provider_rows", """
+    SELECT STATE, CATEGORY, ORGANISATION FROM TRAVELPROVIDERS WHERE STATE <> 'State'
+""")
+
+# --- Experience & Adventure Sports ---
+
+EXPERIENCES = Query("experiences", """
+    SELECT STATE, DESTINATION, NAME_OF_EXPERIENCE
+    FROM SANCTIONEDPROJECTS23TO25
+    WHERE STATE<>'Total'
+""")
+
+PEAKS = Query("peaks", """
+    SELECT STATE, PEAKNAME, HEIGHT, SPORTS
+    FROM MOUNTAINSPORTS
+    WHERE STATE <> 'State'
+""")
+
+MUSEUMS = Query("museums", """
+    SELECT
+        STATE,
+        MUSEUM,
+        CASE
+            WHEN TYPE ILIKE 'Exiting Museum' THEN 'Existing Museum'
+            WHEN TYPE ILIKE 'Existing museum' THEN 'Existing Museum'
+            WHEN TYPE = 'VEM' THEN 'Visitor Experience Management'
+            ELSE TYPE
+        END AS TYPE
+    FROM MUSEUM
+    WHERE STATE != 'Total'
+""")
+
+UNESCO = select("unesco", "UNESCO", ["STATE", "HERITAGESITE", "TYPE"], where=["STATE <> 'State'"])
+
+# Shown as a table with all of its columns
+RSM = Query("rsm", 'SELECT * FROM "TOURISM"."PUBLIC"."RSM"')
+
+# The card picks one random monument of the selected state from these rows
+UNTRACEABLE = select("untraceable", "UNTRACEABLEMONUMENTS", ["STATE", "MONUMENTS"],
+                     where=["STATE <> 'State'"])
+
+# --- Stats ---
+
+# Wide visit tables, one DTVyy/FTVyy column per year. Every column is read
+# so that a new year shows up without code changes (see tourism.visits).
+VISITS_2016_18 = Query("visits_2016_18", "SELECT * FROM VISITDATA")
+
+VISITS_2019_21 = Query("visits_2019_21", "SELECT * FROM VISITDATA2")
+
+ART_CULTURE = Query("art_culture", """
+    SELECT
+      STATE,
+      ORG2018 AS "Org 2018",
+      AMT2018 AS "Amt 2018",
+      ORG2019 AS "Org 2019",
+      AMT2019 AS "Amt 2019",
+      ORG2020 AS "Org 2020",
+      AMT2020 AS "Amt 2020"
+    FROM "TOURISM"."PUBLIC"."ARTCULTURE1"
+    WHERE STATE <> 'Total'
+""")
+
+SCHEME_YEARS = ["Y2019", "Y2020", "Y2021", "Y2022", "Y2023"]
+
+ART_SCHEME_FUNDING = select("art_scheme_funding", '"TOURISM"."PUBLIC"."ART_SCHEME_FUNDING"',
+                            ["SCHEME"] + SCHEME_YEARS, where=["SCHEME <> 'Total'"])
+
+ASI_FUNDING = select("asi_funding", '"TOURISM"."PUBLIC"."ASI_FUNDING"', ["YEAR", "EXPENDITURE"])
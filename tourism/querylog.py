@@ -0,0 +1,105 @@
+"""Per-query records: a structured log line each, plus recent history for admins.
+
+Every query the app runs through ``tourism.db`` is recorded here, cache
+hits included, under the logical name of its ``Query`` template. Misses
+carry the warehouse query id, and run with a ``QUERY_TAG`` naming the
+query, so credit spend and latency in ``QUERY_HISTORY`` can be attributed
+to the chart that caused them.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecord(NamedTuple):
+    name: str
+    backend: str
+    cache_hit: bool
+    wall_ms: float
+    rows: int
+    bytes: int
+    query_id: Optional[str]
+    at: float
+    # Served from an expired cache entry because the warehouse was saturated
+    stale: bool = False
+
+
+def query_tag(name):
+    """QUERY_TAG value for one logical query."""
+    from .config import QUERY_TAG_APP
+
+    return json.dumps({"app": QUERY_TAG_APP, "query": name}, separators=(",", ":"))
+
+
+class QueryLog:
+    """Thread-safe ring buffer of the most recent records, with per-name totals.
+
+    ``bytes`` is the in-memory size of the result frame, the closest
+    client-side measure of what was transferred.
+    """
+
+    def __init__(self, max_records=500, slow_ms=1000):
+        self.slow_ms = slow_ms
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def add(self, name, backend, df, wall_s, cache_hit, query_id=None, stale=False):
+        record = QueryRecord(
+            name=name,
+            backend=backend,
+            cache_hit=cache_hit,
+            wall_ms=round(wall_s * 1000, 2),
+            rows=len(df),
+            bytes=0 if cache_hit else int(df.memory_usage(index=True, deep=True).sum()),
+            query_id=query_id,
+            at=time.time(),
+            stale=stale,
+        )
+        with self._lock:
+            self._records.append(record)
+        slow = not cache_hit and record.wall_ms >= self.slow_ms
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record._asdict()))
+        return record
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def frame(self):
+        """Recent records, newest first."""
+        frame = pd.DataFrame(self.records(), columns=QueryRecord._fields)
+        frame["at"] = pd.to_datetime(frame["at"], unit="s")
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def summary(self):
+        """Per query name: runs, cache hit rate and warehouse latency."""
+        frame = pd.DataFrame(self.records(), columns=QueryRecord._fields)
+        misses = frame[~frame["cache_hit"].astype(bool)].groupby("name")["wall_ms"]
+        return pd.DataFrame({
+            "runs": frame.groupby("name").size(),
+            "hit_rate": frame.groupby("name")["cache_hit"].mean().round(2),
+            "misses": misses.size(),
+            "p50_ms": misses.median(),
+            "max_ms": misses.max(),
+            "stale": frame.groupby("name")["stale"].sum(),
+            "rows": frame.groupby("name")["rows"].max(),
+        }).fillna({"misses": 0}).sort_values("max_ms", ascending=False)
+
+    def slow(self):
+        return [r for r in self.records() if not r.cache_hit and r.wall_ms >= self.slow_ms]
+
+
+@st.cache_resource
+def get_query_log():
+    from .config import QUERY_LOG_SIZE, SLOW_QUERY_MS
+
+    return QueryLog(max_records=QUERY_LOG_SIZE, slow_ms=SLOW_QUERY_MS)
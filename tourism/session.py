@@ -0,0 +1,138 @@
+"""Bounded pool of Snowpark sessions shared across reruns and users."""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from . import timing
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """Hands out live Snowpark sessions, creating at most ``size`` of them.
+
+    Sessions idle for longer than ``ping_after`` seconds are pinged before
+    they are handed out again; a session that fails the check (or fails while
+    in use) is closed and replaced with a fresh login. Waits of ``warn_after``
+    seconds or more are logged as warnings.
+    """
+
+    def __init__(self, factory, size=4, ping_after=300, acquire_timeout=60, warn_after=0.5):
+        self._factory = factory
+        self._warn_after = warn_after
+        self._size = size
+        self._ping_after = ping_after
+        self._acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "reconnects": 0,
+            "wait_total_s": 0.0,
+            "wait_max_s": 0.0,
+            "wait_last_s": 0.0,
+        }
+
+    @contextmanager
+    def session(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self._acquire_timeout):
+            raise TimeoutError(
+                f"No Snowflake session became free within {self._acquire_timeout}s"
+            )
+        try:
+            session = self._checkout()
+            self._record_wait(time.perf_counter() - start)
+            try:
+                yield session
+            except Exception:
+                # The query may have failed because the connection dropped;
+                # only return the session to the pool if it is still usable.
+                if self._is_alive(session):
+                    self._idle.put((session, time.monotonic()))
+                else:
+                    self._discard(session)
+                raise
+            else:
+                self._idle.put((session, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self._size
+        stats["idle"] = self._idle.qsize()
+        return stats
+
+    def close(self):
+        while True:
+            try:
+                session, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(session)
+
+    def _checkout(self):
+        try:
+            session, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+        stale = time.monotonic() - last_used > self._ping_after
+        if self._is_alive(session, ping=stale):
+            return session
+        logger.info("Snowflake session went stale, reconnecting")
+        self._discard(session)
+        with self._lock:
+            self._stats["reconnects"] += 1
+        return self._create()
+
+    def _create(self):
+        session = self._factory()
+        with self._lock:
+            self._stats["created"] += 1
+        return session
+
+    def _is_alive(self, session, ping=False):
+        try:
+            if session.connection.is_closed():
+                return False
+            if ping:
+                session.sql("SELECT 1").collect()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, session):
+        try:
+            session.close()
+        except Exception:
+            logger.debug("Ignoring error while closing Snowflake session", exc_info=True)
+
+    def _record_wait(self, waited):
+        with self._lock:
+            self._stats["acquired"] += 1
+            self._stats["wait_total_s"] += waited
+            self._stats["wait_last_s"] = waited
+            self._stats["wait_max_s"] = max(self._stats["wait_max_s"], waited)
+        level = logging.WARNING if waited >= self._warn_after else logging.DEBUG
+        logger.log(level, "Acquired Snowflake session in %.1f ms", waited * 1000)
+        timing.record("session", waited)
+
+
+@st.cache_resource
+def get_session_pool():
+    from snowflake.snowpark import Session
+
+    from .config import SESSION_POOL_SIZE, SLOW_SESSION_WAIT_MS
+
+    config = dict(st.secrets["connections"]["snowflake"])
+    return SessionPool(lambda: Session.builder.configs(config).create(), size=SESSION_POOL_SIZE,
+                       warn_after=SLOW_SESSION_WAIT_MS / 1000)
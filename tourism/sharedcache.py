@@ -0,0 +1,170 @@
+"""Second-level cache in a SQLite file shared by the server processes on a host.
+
+With several Streamlit workers behind a load balancer, each process would
+otherwise run every query and build every figure itself. A ``QueryCache``
+given a ``SharedStore`` looks there on a miss and writes through to it, so
+whatever one worker fetched or built is a disk read away for the others.
+Values are pickled; once the file holds more than ``max_bytes``, the
+entries closest to expiry are evicted first. Reads never write, so workers
+reading the same entries do not contend for SQLite's write lock.
+
+The file is only a cache: when it cannot be read or written (locked for
+too long, disk full, or an entry pickled by other library versions during
+a rolling deploy), a warning is logged and the lookup counts as a miss.
+"""
+
+import functools
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+
+from .cache import MISSING
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    key_blob BLOB NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+def _fallback(default):
+    """Log any error of a SharedStore method and return ``default`` instead."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as error:
+                logger.warning("Shared cache %s (%s) failed in %s: %r",
+                               self.path, self.namespace, method.__name__, error)
+                return default
+        return wrapper
+    return decorate
+
+
+class SharedStore:
+    """One namespace (e.g. "queries") of the shared cache file at ``path``.
+
+    Expiry uses wall-clock time, since the monotonic clock is per process.
+    """
+
+    def __init__(self, path, namespace, max_bytes=512 * 1024 * 1024):
+        self.path = str(path)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @_fallback(MISSING)
+    def get(self, key, stale=False):
+        """(value, seconds left to live), or MISSING; ``stale`` ignores expiry."""
+        row = self._conn().execute(
+            "SELECT value, expires FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, repr(key)),
+        ).fetchone()
+        now = time.time()
+        if row is None or (row[1] < now and not stale):
+            return MISSING
+        return pickle.loads(row[0]), row[1] - now
+
+    @_fallback(None)
+    def put(self, key, value, ttl):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        conn = self._conn()
+        with _transaction(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, repr(key), pickle.dumps(key), blob, len(blob), time.time() + ttl),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        # Across namespaces: the size limit is for the whole file
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for namespace, key, size in conn.execute(
+            "SELECT namespace, key, size FROM cache_entries ORDER BY expires"
+        ).fetchall():
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @_fallback(0)
+    def invalidate(self, predicate=None):
+        """Drop every entry of this namespace, or only those whose key matches ``predicate``.
+
+        Keys that cannot be unpickled here are dropped too.
+        """
+        conn = self._conn()
+        with _transaction(conn):
+            if predicate is None:
+                return conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+                ).rowcount
+            keys = [
+                key for key, key_blob in conn.execute(
+                    "SELECT key, key_blob FROM cache_entries WHERE namespace = ?", (self.namespace,)
+                )
+                if _matches(predicate, key_blob)
+            ]
+            conn.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                             [(self.namespace, key) for key in keys])
+            return len(keys)
+
+    @_fallback({})
+    def stats(self):
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+def _matches(predicate, key_blob):
+    try:
+        return predicate(pickle.loads(key_blob))
+    except Exception:
+        return True
+
+
+class _transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def shared_store(namespace):
+    """The ``namespace`` of the configured shared cache file, or None if there is none."""
+    from .config import SHARED_CACHE, SHARED_CACHE_MAX_BYTES
+
+    if not SHARED_CACHE:
+        return None
+    return SharedStore(SHARED_CACHE, namespace, SHARED_CACHE_MAX_BYTES)
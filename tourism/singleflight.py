@@ -0,0 +1,41 @@
+"""Collapse identical concurrent calls into one.
+
+When many sessions start at once they all miss the cache for the same
+queries and figures. The first caller of a key runs the work; callers that
+arrive while it is in flight wait for it and share its result (or its
+exception) instead of running it again.
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """(result of ``fn()``, shared): ``shared`` is True if another caller ran it."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,75 @@
+"""Export every table the app reads to typed Parquet files.
+
+    python -m tourism.snapshot [--from local|snowflake] [OUT_DIR]
+
+Run with ``TOURISM_BACKEND=snapshot`` (and ``TOURISM_SNAPSHOT_DIR`` if the
+files are not in ``./snapshot``) to serve the app from the export.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from .sources import MISSING_TABLES, SOURCES
+
+TABLES = [source.table for source in SOURCES] + list(MISSING_TABLES)
+MANIFEST = "manifest.json"
+
+
+def export_snapshot(backend, out_dir, tables=TABLES):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"exported_at": time.time(), "source": backend.name, "tables": {}}
+    for table in tables:
+        # Through Arrow rather than pandas, so columns of empty tables keep
+        # their types instead of becoming untyped nulls
+        arrow = backend.arrow(f"SELECT * FROM {table}")
+        # Write next to the target and rename, so a running app never sees a
+        # half-written file.
+        tmp = out_dir / f".{table}.parquet.tmp"
+        pq.write_table(arrow, tmp)
+        os.replace(tmp, out_dir / f"{table}.parquet")
+        manifest["tables"][table] = {
+            "rows": arrow.num_rows,
+            "schema": {field.name: str(field.type) for field in arrow.schema},
+        }
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def snapshot_files(snapshot_dir):
+    files = {path.stem: path for path in sorted(Path(snapshot_dir).glob("*.parquet"))}
+    if not files:
+        raise FileNotFoundError(
+            f"No snapshot in {snapshot_dir}; create one with python -m tourism.snapshot"
+        )
+    return files
+
+
+def main(argv=None):
+    from .backends import DuckDBBackend, SnowflakeBackend
+    from .config import SNAPSHOT_DIR
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", nargs="?", default=SNAPSHOT_DIR)
+    parser.add_argument("--from", dest="source", choices=["local", "snowflake"], default="snowflake",
+                        help="read the tables from data/*.csv or from the warehouse")
+    args = parser.parse_args(argv)
+
+    if args.source == "local":
+        backend = DuckDBBackend.from_csv()
+    else:
+        from .session import get_session_pool
+
+        backend = SnowflakeBackend(get_session_pool())
+    manifest = export_snapshot(backend, args.out_dir)
+    for table, info in manifest["tables"].items():
+        print(f"{table:<28} {info['rows']:>6} rows")
+
+
+if __name__ == "__main__":
+    main()
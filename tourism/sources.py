@@ -0,0 +1,101 @@
+"""The data.gov.in CSVs in ``data/`` and the warehouse tables they feed."""
+
+import codecs
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+class CsvSource(NamedTuple):
+    table: str
+    file: str
+    # Warehouse column names, in CSV column order
+    columns: list
+    # Columns read as numbers; the others are text. Declared rather than
+    # inferred so that every chunk of a streamed file gets the same types.
+    numeric: dict = {}
+
+    @property
+    def dtypes(self):
+        return {column: self.numeric.get(column, "str") for column in self.columns}
+
+
+# Amounts may be fractional or missing; counts are whole but may be missing
+AMOUNT = "float64"
+COUNT = "Int64"
+
+SOURCES = [
+    CsvSource("PRASHAD", "PRASHAD.csv",
+              ["SLNO", "STATE", "PROJECTNAME", "SANCTIONYEAR", "APPROVEDCOST"],
+              {"APPROVEDCOST": AMOUNT}),
+    CsvSource("FAIRSANDCARNIVALSBYSTATE", "Fairs & Carnivals by State.csv",
+              ["SLNO", "STATE", "NAMEOFFAIRS", "SANCTIONYEAR", "AMOUNTSANCTIONED", "AMOUNTRELEASED"],
+              {"AMOUNTSANCTIONED": AMOUNT, "AMOUNTRELEASED": AMOUNT}),
+    CsvSource("TRAVELPROVIDERS", "Approved_Travel_Providers.csv",
+              ["STATE", "CATEGORY", "ORGANISATION", "OFFICETYPE", "NODALOFFICER",
+               "EMAILWEBSITE", "APPROVALNUMBER", "APPROVALDATE", "VALIDUPTO"]),
+    CsvSource("SANCTIONEDPROJECTS23TO25", "Sanctioned Projects Darshan 2.0 23-25.csv",
+              ["YEAROFSANCTION", "STATE", "DESTINATION", "NAME_OF_EXPERIENCE", "SANCTIONEDCOST"],
+              {"SANCTIONEDCOST": AMOUNT}),
+    CsvSource("MUSEUM", "RS_Session_266_AU_1944_1.csv",
+              ["SLNO", "STATE", "MUSEUM", "TYPE", "Y2019_20", "Y2020_21", "Y2021_22", "Y2022_23", "Y2023_24"],
+              dict.fromkeys(["Y2019_20", "Y2020_21", "Y2021_22", "Y2022_23", "Y2023_24"], AMOUNT)),
+    CsvSource("VISITDATA", "Domestic&ForiegnVisits2016to18.csv",
+              ["SLNO", "STATES", "DTV16", "FTV16", "DTV17", "FTV17", "DTV18", "FTV18"],
+              dict.fromkeys(["DTV16", "FTV16", "DTV17", "FTV17", "DTV18", "FTV18"], COUNT)),
+    CsvSource("VISITDATA2", "Domestic & Foriegn Visits 2019-21.csv",
+              ["SLNO", "STATE", "DTV19", "FTV19", "DTV20", "FTV20", "DTV21", "FTV21"],
+              dict.fromkeys(["DTV19", "FTV19", "DTV20", "FTV20", "DTV21", "FTV21"], COUNT)),
+]
+
+# Tables the app reads that have no CSV in data/ yet. Only the columns the
+# app actually uses are declared, so they load as empty tables.
+MISSING_TABLES = {
+    "MOUNTAINSPORTS": {"STATE": "VARCHAR", "PEAKNAME": "VARCHAR", "HEIGHT": "DOUBLE", "SPORTS": "VARCHAR"},
+    "UNESCO": {"STATE": "VARCHAR", "HERITAGESITE": "VARCHAR", "TYPE": "VARCHAR"},
+    "RSM": {"STATE": "VARCHAR"},
+    "UNTRACEABLEMONUMENTS": {"STATE": "VARCHAR", "MONUMENTS": "VARCHAR"},
+    "ARTCULTURE1": {
+        "STATE": "VARCHAR",
+        "ORG2018": "DOUBLE", "AMT2018": "DOUBLE",
+        "ORG2019": "DOUBLE", "AMT2019": "DOUBLE",
+        "ORG2020": "DOUBLE", "AMT2020": "DOUBLE",
+    },
+    "ART_SCHEME_FUNDING": {
+        "SCHEME": "VARCHAR",
+        "Y2019": "DOUBLE", "Y2020": "DOUBLE", "Y2021": "DOUBLE", "Y2022": "DOUBLE", "Y2023": "DOUBLE",
+    },
+    "ASI_FUNDING": {"YEAR": "VARCHAR", "EXPENDITURE": "DOUBLE"},
+}
+
+
+# Values of a state column that mark a totals row or a repeated header
+NON_STATE_VALUES = {"total", "grand total", "state", "states", "state/ut", "states/uts", "state/ uts"}
+
+
+def detect_encoding(path, block_size=1 << 16):
+    """Return "utf-8" if the whole file decodes as UTF-8, else "cp1252"."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        try:
+            for block in iter(lambda: f.read(block_size), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            # Some of the exports are Windows-1252 rather than UTF-8
+            return "cp1252"
+    return "utf-8"
+
+
+def read_source(source, data_dir=DATA_DIR, **kwargs):
+    """Read one CSV with warehouse column names and types; extra kwargs go to read_csv.
+
+    Pass ``chunksize`` to get an iterator of frames instead of one frame.
+    SLNO is read as text, since totals rows put words in it.
+    """
+    path = Path(data_dir) / source.file
+    return pd.read_csv(path, header=0, names=source.columns, dtype=source.dtypes,
+                       encoding=detect_encoding(path), **kwargs)
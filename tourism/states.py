@@ -0,0 +1,150 @@
+"""Canonical state/UT dimension with stable integer keys.
+
+Every table is mapped onto this dimension when it is loaded: state names
+are normalized once, and filters and joins then compare ``STATE_ID``
+integers instead of running string functions on every rerun.
+"""
+
+import logging
+
+import pandas as pd
+import streamlit as st
+
+from . import queries
+from .cache import register_invalidation
+from .config import CACHE_TTL
+from .db import run_query
+from .sources import NON_STATE_VALUES
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+# Position in this list (1-based) is the STATE_ID, so only ever append.
+STATES = [
+    "Andaman and Nicobar Islands",
+    "Andhra Pradesh",
+    "Arunachal Pradesh",
+    "Assam",
+    "Bihar",
+    "Chandigarh",
+    "Chhattisgarh",
+    "Dadra and Nagar Haveli",
+    "Daman and Diu",
+    "Delhi",
+    "Goa",
+    "Gujarat",
+    "Haryana",
+    "Himachal Pradesh",
+    "Jammu and Kashmir",
+    "Jharkhand",
+    "Karnataka",
+    "Kerala",
+    "Ladakh",
+    "Lakshadweep",
+    "Madhya Pradesh",
+    "Maharashtra",
+    "Manipur",
+    "Meghalaya",
+    "Mizoram",
+    "Nagaland",
+    "Odisha",
+    "Puducherry",
+    "Punjab",
+    "Rajasthan",
+    "Sikkim",
+    "Tamil Nadu",
+    "Telangana",
+    "Tripura",
+    "Uttar Pradesh",
+    "Uttarakhand",
+    "West Bengal",
+    "Dadra and Nagar Haveli and Daman and Diu",
+]
+
+STATE_IDS = {name: i for i, name in enumerate(STATES, start=1)}
+
+# Spellings found in the sources, after trailing footnote markers are
+# stripped and "&" is spelled "and"; matched case-insensitively
+STATE_VARIANTS = {
+    "andman and nicobar": "Andaman and Nicobar Islands",
+    "chattisgarh": "Chhattisgarh",
+    "leh and ladakh": "Ladakh",
+    "new delhi": "Delhi",
+    "orissa": "Odisha",
+    "pondicherry": "Puducherry",
+    "tamilnadu": "Tamil Nadu",
+    "telengana": "Telangana",
+    "uttrakhand": "Uttarakhand",
+}
+
+_LOOKUP = {name.lower(): name for name in STATES}
+_LOOKUP.update(STATE_VARIANTS)
+
+
+def normalize_states(states):
+    """Vectorized mapping of raw state names to canonical ones.
+
+    Names that match no state are returned stripped but otherwise as-is.
+    """
+    cleaned = (
+        states.str.strip()
+        .str.rstrip("* ")
+        .str.replace(r"\s*&\s*", " and ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+    )
+    return cleaned.str.lower().map(_LOOKUP).fillna(cleaned)
+
+
+def encode_states(df, column="STATE"):
+    """Canonicalize ``df[column]`` and add its ``STATE_ID``, in place."""
+    names = normalize_states(df[column])
+    ids = names.map(STATE_IDS).astype("Int16")
+    unknown = names[ids.isna() & names.notna() & ~names.str.lower().isin(NON_STATE_VALUES)]
+    for name in unknown.unique():
+        logger.warning("Unknown state name %r in column %s", name, column)
+    df[column] = names
+    df["STATE_ID"] = ids
+    return df
+
+
+def state_dimension():
+    return pd.DataFrame({"STATE_ID": range(1, len(STATES) + 1), "STATE": STATES}).astype(
+        {"STATE_ID": "int16"}
+    )
+
+
+class StateTable:
+    """Which states have data in each section, from one cached query.
+
+    Built from ``(SECTION, STATE)`` rows with the raw warehouse names; serves
+    the state selectors, and the raw spellings to filter on in SQL.
+    """
+
+    def __init__(self, rows):
+        rows = encode_states(rows.assign(RAW=rows["STATE"]))
+        rows = rows[rows["STATE_ID"].notna()]
+        self._names = {
+            section: sorted(frame["STATE"].unique().tolist())
+            for section, frame in rows.groupby("SECTION")
+        }
+        self._spellings = {
+            state: sorted(frame["RAW"].unique().tolist())
+            for state, frame in rows.groupby("STATE")
+        }
+
+    def names(self, section):
+        return self._names.get(section, [])
+
+    def spellings(self, state):
+        """Raw STATE values of the warehouse tables that mean ``state``."""
+        return self._spellings.get(state, [state])
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def get_state_table():
+    rows = run_query(queries.STATE_NAMES)
+    with timed("transform"):
+        return StateTable(rows)
+
+
+register_invalidation(get_state_table.clear, queries.STATE_NAMES.tables)
@@ -0,0 +1,44 @@
+"""Opt-in timing of the data path, used by the benchmark harness.
+
+Code marks its phases with ``timed("query:fairs_rows")`` etc. Outside a
+``recording()`` block that costs one global lookup; inside it, every
+phase's duration is appended to the recording, from any thread.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_samples = None
+
+
+def record(phase, seconds):
+    samples = _samples
+    if samples is not None:
+        with _lock:
+            samples.append((phase, seconds))
+
+
+@contextmanager
+def timed(phase):
+    if _samples is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - start)
+
+
+@contextmanager
+def recording():
+    """Collect ``(phase, seconds)`` samples until the block exits."""
+    global _samples
+    samples = []
+    _samples = samples
+    try:
+        yield samples
+    finally:
+        _samples = None
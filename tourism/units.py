@@ -0,0 +1,26 @@
+"""Monetary units of the source tables, and conversion to lakh."""
+
+# Rupees in one unit, relative to a lakh
+LAKH_PER_UNIT = {"lakh": 1, "crore": 100}
+
+# Unit each money column is published in on data.gov.in
+SOURCE_UNITS = {
+    "PRASHAD": {"APPROVEDCOST": "crore"},
+    "SANCTIONEDPROJECTS23TO25": {"SANCTIONEDCOST": "crore"},
+    "FAIRSANDCARNIVALSBYSTATE": {"AMOUNTSANCTIONED": "lakh", "AMOUNTRELEASED": "lakh"},
+}
+
+
+def to_lakh(df, table, aliases=None):
+    """Convert ``table``'s money columns in ``df`` to lakh, in place.
+
+    ``aliases`` maps a source column to the name it has in ``df`` (e.g. after
+    ``SUM(APPROVEDCOST) AS AMOUNT``). Columns not present are skipped.
+    """
+    aliases = aliases or {}
+    for column, unit in SOURCE_UNITS.get(table, {}).items():
+        column = aliases.get(column, column)
+        factor = LAKH_PER_UNIT[unit]
+        if column in df.columns and factor != 1:
+            df[column] = df[column] * factor
+    return df
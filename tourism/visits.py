@@ -0,0 +1,67 @@
+"""Domestic and foreign tourist visits as one long fact table.
+
+The source tables are wide, with a ``DTVyy``/``FTVyy`` column per year and
+a differently spelled state column each. They are reshaped once per load
+into rows of (STATE_ID, STATE, YEAR, KIND, VISITS), so a new year is new
+rows rather than a new column anywhere in the app.
+"""
+
+import re
+
+import pandas as pd
+import streamlit as st
+
+from . import queries
+from .cache import register_invalidation
+from .config import CACHE_TTL
+from .db import run_queries
+from .frames import compact
+from .states import encode_states
+from .timing import timed
+
+_VISIT_COLUMN = re.compile(r"^(DTV|FTV)(\d{2})$")
+KINDS = {"DTV": "Domestic", "FTV": "Foreign"}
+
+FACT_COLUMNS = ["STATE_ID", "STATE", "YEAR", "KIND", "VISITS"]
+
+
+def to_facts(wide, state_column="STATE"):
+    """Long visit rows from one wide table; rows of unknown states are dropped."""
+    wide = encode_states(wide, state_column).rename(columns={state_column: "STATE"})
+    wide = wide[wide["STATE_ID"].notna()]
+    columns = [column for column in wide.columns if _VISIT_COLUMN.match(column)]
+    facts = wide.melt(id_vars=["STATE_ID", "STATE"], value_vars=columns,
+                      var_name="COLUMN", value_name="VISITS")
+    parts = facts.pop("COLUMN").str.extract(_VISIT_COLUMN)
+    facts["KIND"] = parts[0].map(KINDS)
+    facts["YEAR"] = 2000 + parts[1].astype(int)
+    facts["VISITS"] = pd.to_numeric(facts["VISITS"], errors="coerce")
+    return facts[FACT_COLUMNS]
+
+
+class Visits:
+    """The fact table, with each state's rows split out once per load."""
+
+    def __init__(self, facts):
+        self.facts = facts.sort_values(["KIND", "YEAR", "STATE_ID"], ignore_index=True)
+        self._by_state = {
+            state: frame.reset_index(drop=True)
+            for state, frame in self.facts.groupby("STATE", observed=True)
+        }
+        self.states = sorted(self._by_state)
+
+    def rows(self, kind, state="All"):
+        """Rows of one KIND ("Domestic" or "Foreign") for a state or "All"."""
+        frame = self.facts if state == "All" else self._by_state.get(state, self.facts.iloc[0:0])
+        return frame[frame["KIND"] == kind]
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def get_visits():
+    data = run_queries({"early": queries.VISITS_2016_18, "late": queries.VISITS_2019_21})
+    with timed("transform"):
+        facts = pd.concat([to_facts(data["early"], "STATES"), to_facts(data["late"])], ignore_index=True)
+        return Visits(compact(facts, categorical=("KIND",)))
+
+
+register_invalidation(get_visits.clear, queries.VISITS_2016_18.tables | queries.VISITS_2019_21.tables)
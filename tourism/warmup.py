@@ -0,0 +1,102 @@
+"""Precompute every section's data and figures when the server starts.
+
+There are only a few dozen states and a fixed set of charts per section,
+so rather than the first visitor to pick a state paying for its queries
+and figures, ``start_warmup()`` walks every (chart, state) of
+``tourism.charts.SECTIONS`` once per process: "All" first, then each state
+of the section's selector. It fills the same caches the app reads, and
+stops early once its time budget is spent.
+"""
+
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from . import charts
+
+logger = logging.getLogger(__name__)
+
+THREAD_NAME = "warmup"
+
+
+class _NoContextWarning(logging.Filter):
+    """Drops Streamlit's "missing ScriptRunContext" warnings from the warm-up thread."""
+
+    def filter(self, record):
+        return record.threadName != THREAD_NAME or "missing ScriptRunContext" not in record.getMessage()
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_NoContextWarning())
+
+
+class Warmup:
+    def __init__(self, budget):
+        self.budget = budget
+        self.total = None
+        self.done = 0
+        self.started_at = None
+        self.finished_at = None
+        self.stopped_early = False
+        self.error = None
+
+    def plan(self):
+        """Every (chart, state) to build, most visited ("All") first."""
+        steps = []
+        for states, section_charts in charts.SECTIONS.values():
+            for state in ["All"] + states():
+                steps.extend(
+                    (chart, state) for chart in section_charts
+                    if state == "All" or chart not in charts.STATELESS
+                )
+        return sorted(steps, key=lambda step: step[1] != "All")
+
+    def run(self):
+        self.started_at = time.monotonic()
+        try:
+            steps = self.plan()
+            self.total = len(steps)
+            for chart, state in steps:
+                if time.monotonic() - self.started_at > self.budget:
+                    self.stopped_early = True
+                    logger.warning("Warm-up stopped after %.0fs budget: %d of %d figures built",
+                                   self.budget, self.done, self.total)
+                    break
+                charts.figure(chart, state)
+                self.done += 1
+        except Exception as error:
+            self.error = repr(error)
+            logger.exception("Warm-up failed after %d figures", self.done)
+        finally:
+            self.finished_at = time.monotonic()
+        logger.info("Warm-up built %d/%s figures in %.1fs", self.done, self.total,
+                    self.finished_at - self.started_at)
+
+    def progress(self):
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.monotonic()) - self.started_at, 1)
+        return {
+            "done": self.done,
+            "total": self.total,
+            "elapsed_s": elapsed,
+            "running": self.started_at is not None and self.finished_at is None,
+            "stopped_early": self.stopped_early,
+            "error": self.error,
+        }
+
+
+@st.cache_resource
+def start_warmup():
+    """Start (or, in "blocking" mode, run) the warm-up once per process."""
+    from .config import WARMUP, WARMUP_BUDGET
+
+    warmup = Warmup(WARMUP_BUDGET)
+    if WARMUP == "blocking":
+        warmup.run()
+    elif WARMUP == "background":
+        # Runs without a ScriptRunContext: attaching a visitor's would send the
+        # cached loaders' output to that visitor's page
+        threading.Thread(target=warmup.run, name=THREAD_NAME, daemon=True).start()
+    return warmup
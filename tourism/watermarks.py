@@ -0,0 +1,86 @@
+"""Invalidate cached data when, and only when, the tables behind it change.
+
+A background thread polls the backend's version of every table it serves
+(``SHOW TABLES`` metadata in Snowflake, the file's mtime and size locally) every
+``WATERMARK_INTERVAL`` seconds. A table whose version moved has its query
+results, shared frames and figures dropped (``cache.invalidate_tables``);
+everything else stays cached, so the TTL is only a backstop.
+
+The versions are part of every cache key, so entries of the cache shared
+between processes (tourism.sharedcache) that were written before a table
+changed, even while this process was not running, are never read back.
+"""
+
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from .backends import get_backend
+from .cache import invalidate_tables, set_table_versions
+
+logger = logging.getLogger(__name__)
+
+
+class Watermarks:
+    def __init__(self, backend, interval):
+        self.backend = backend
+        self.interval = interval
+        self.versions = {}
+        self.checked_at = None
+        self.changed = []
+        self.error = None
+
+    def check(self):
+        """Poll once; return the tables that changed since the previous poll."""
+        versions = self.backend.table_versions()
+        changed = sorted(
+            table for table in set(versions) | set(self.versions)
+            if self.checked_at is not None and versions.get(table) != self.versions.get(table)
+        )
+        if self.checked_at is None:
+            set_table_versions(versions)
+        self.versions = versions
+        self.checked_at = time.time()
+        if changed:
+            dropped = invalidate_tables({table: versions.get(table) for table in changed})
+            self.changed = changed
+            logger.info("Tables changed: %s; dropped %d cached results", ", ".join(changed), dropped)
+        return changed
+
+    def poll(self):
+        try:
+            self.check()
+            self.error = None
+        except Exception as error:
+            self.error = repr(error)
+            logger.exception("Polling table versions failed")
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+    def status(self):
+        return {
+            "tables": len(self.versions),
+            "checked_at": self.checked_at,
+            "last_changed": self.changed,
+            "error": self.error,
+        }
+
+
+@st.cache_resource
+def start_watermarks():
+    """Read the table versions, then poll them once per process (unless the interval is 0).
+
+    The first read happens before any data is cached, since it keys the caches.
+    """
+    from .config import WATERMARK_INTERVAL
+
+    watermarks = Watermarks(get_backend(), WATERMARK_INTERVAL)
+    watermarks.poll()
+    if WATERMARK_INTERVAL > 0:
+        threading.Thread(target=watermarks.run, name="watermarks", daemon=True).start()
+    return watermarks